@@ -2,15 +2,40 @@
 ASA Asistan Flask API — Mistral AI + çok sayfalı crawler + rakip karşılaştırma + AI Ads.
 """
 import os
+import asyncio
+import json
 import logging
+import re
+import threading
+import orjson
 import requests
-from flask import Flask, request, jsonify
+from cachetools import TTLCache
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from crawler import scrape_seo
+from urllib.parse import urlparse, urlsplit, urlunsplit
+from llm_cache import LLMCache
+from semantic_cache import SemanticCache
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask'ın saf Python json'u yerine orjson: büyük crawler_data yanıtlarında 2-10x hızlı."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+MAX_RIVALS = 5
+
 MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY", "")
 MISTRAL_MODEL = "open-mistral-7b"
 MISTRAL_HOST = "https://api.mistral.ai/v1/chat/completions"
@@ -18,35 +43,236 @@ MISTRAL_HOST = "https://api.mistral.ai/v1/chat/completions"
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Deterministik (temperature=0) çağrılar için yanıt önbelleği
+LLM_CACHE = LLMCache(
+    maxsize=512,
+    ttl=int(os.environ.get("LLM_CACHE_TTL", 3600)),
+    redis_url=os.environ.get("REDIS_URL"),
+)
+
+# Tarama sonuçları için kısa TTL cache: analyze→ads ardışık çağrıları tek tarama yapar
+CRAWL_CACHE = TTLCache(maxsize=256, ttl=int(os.environ.get("CRAWL_CACHE_TTL", 300)))
+_crawl_lock = threading.Lock()
+# Single-flight: aynı URL için eşzamanlı istekler ilk taramanın sonucunu bekler
+_inflight_crawls = {}  # url -> Future
+
+# Semantik cache (SEMANTIC_CACHE=1 ile açılır; model indirme maliyeti nedeniyle varsayılan kapalı)
+SEM_CACHE = SemanticCache() if os.environ.get("SEMANTIC_CACHE") == "1" else None
+
+# Mistral'e aynı anda giden istek sayısını sınırla (rate limit koruması)
+_LLM_SEM = threading.BoundedSemaphore(int(os.environ.get("LLM_MAX_CONCURRENCY", 8)))
+
+# Mistral için kalıcı bağlantı havuzu: her çağrıda TLS el sıkışmasını tekrarlamaz
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Model çıktısının başındaki/sonundaki ``` çitlerini tek geçişte temizler
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+
+DEFAULT_SYSTEM = "Sen Türk KOBİ'lere SEO ve dijital pazarlama danışmanlığı yapan ASA Asistan'sın. Türkçe, kısa ve pratik yanıtlar ver."
+MAX_TOKENS = 1000
+
+
+def _llm_cache_key(prompt: str, system: str, temperature: float, max_tokens: int) -> str:
+    return LLMCache.make_key(
+        model=MISTRAL_MODEL, system=system, prompt=prompt,
+        max_tokens=max_tokens, temperature=temperature,
+    )
+
+
+def _mistral_body(prompt: str, system: str, temperature: float, max_tokens: int,
+                  stream: bool = False) -> bytes:
+    """İstek gövdesini orjson ile önceden serialize eder (requests'in json= yoluna göre hızlı)."""
+    payload = {
+        "model": MISTRAL_MODEL,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    if stream:
+        payload["stream"] = True
+    return orjson.dumps(payload)
+
 
-def call_mistral(prompt: str, system: str = None) -> str:
+def _mistral_headers(body: bytes) -> dict:
+    return {
+        "Authorization": f"Bearer {MISTRAL_API_KEY}",
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+    }
+
+
+def call_mistral(prompt: str, system: str = None, temperature: float = 0.7,
+                 max_tokens: int = MAX_TOKENS) -> str:
     if not MISTRAL_API_KEY:
         raise ValueError("MISTRAL_API_KEY ayarlanmamış")
     if not system:
-        system = "Sen Türk KOBİ'lere SEO ve dijital pazarlama danışmanlığı yapan ASA Asistan'sın. Türkçe, kısa ve pratik yanıtlar ver."
+        system = DEFAULT_SYSTEM
+    # Sadece deterministik çağrılar cache'lenir
+    cacheable = temperature == 0
+    if cacheable:
+        key = _llm_cache_key(prompt, system, temperature, max_tokens)
+        cached = LLM_CACHE.get(key)
+        if cached is not None:
+            return cached
+    body = _mistral_body(prompt, system, temperature, max_tokens)
     try:
-        r = requests.post(
-            MISTRAL_HOST,
-            headers={"Authorization": f"Bearer {MISTRAL_API_KEY}", "Content-Type": "application/json"},
-            json={
-                "model": MISTRAL_MODEL,
-                "messages": [
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            },
-            timeout=60
-        )
+        with _LLM_SEM:
+            r = SESSION.post(MISTRAL_HOST, headers=_mistral_headers(body), data=body, timeout=60)
         r.raise_for_status()
-        return r.json()["choices"][0]["message"]["content"].strip()
+        text = orjson.loads(r.content)["choices"][0]["message"]["content"].strip()
     except requests.exceptions.Timeout:
         raise ValueError("Mistral yanıt vermedi (zaman aşımı)")
     except requests.exceptions.HTTPError as e:
         raise ValueError(f"Mistral HTTP hatası: {e}")
     except Exception as e:
         raise ValueError(f"Mistral hatası: {e}")
+    if cacheable:
+        LLM_CACHE.set(key, text)
+    return text
+
+
+def call_mistral_stream(prompt: str, system: str = None, temperature: float = 0.7):
+    """Mistral yanıtını SSE akışından parça parça üretir (generator).
+
+    Toplam süre değişmez ama ilk parça ~saniyeler yerine ~yüz ms'de gelir.
+    """
+    if not MISTRAL_API_KEY:
+        raise ValueError("MISTRAL_API_KEY ayarlanmamış")
+    if not system:
+        system = DEFAULT_SYSTEM
+    body = _mistral_body(prompt, system, temperature, MAX_TOKENS, stream=True)
+    try:
+        with _LLM_SEM:
+            r = SESSION.post(MISTRAL_HOST, headers=_mistral_headers(body), data=body,
+                             timeout=60, stream=True)
+            r.raise_for_status()
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                delta = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+    except requests.exceptions.Timeout:
+        raise ValueError("Mistral yanıt vermedi (zaman aşımı)")
+    except requests.exceptions.HTTPError as e:
+        raise ValueError(f"Mistral HTTP hatası: {e}")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Mistral hatası: {e}")
+
+
+async def call_mistral_async(prompt: str, system: str = None, temperature: float = 0.7,
+                             max_tokens: int = MAX_TOKENS) -> str:
+    """call_mistral'i worker thread'de çalıştırır (async view'lar için).
+
+    asgiref her istekte yeni bir event loop kurup kapattığı için modül
+    seviyesinde async bir HTTP istemcisi kullanılamaz: önceki isteğin
+    loop'unda açılan keep-alive bağlantısı bir sonraki istekte "Event loop
+    is closed" ile patlar. SESSION havuzu thread'ler arasında güvenle
+    paylaşıldığından kalıcı bağlantılar burada da korunur.
+    """
+    return await asyncio.to_thread(call_mistral, prompt, system, temperature, max_tokens)
+
+
+def _normalize_url(u: str) -> str:
+    """Şema ekler, host'u küçük harfe çevirir, fragment ve sondaki /'ı atar.
+
+    "example.com" ve "https://Example.com/" aynı taramaya (ve aynı cache
+    anahtarına) düşer.
+    """
+    u = (u or "").strip()
+    if not u:
+        return ""
+    if not u.startswith(("http://", "https://")):
+        u = "https://" + u
+    parts = urlsplit(u)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+async def _site_analysis_async(site_data: dict):
+    """Karşılaştırma sırasında kendi site analizini paralel üretir; hata yutar."""
+    if site_data.get("error"):
+        return None
+    try:
+        return await call_mistral_async(build_analysis_prompt(site_data))
+    except ValueError as e:
+        logger.warning(f"Site analizi atlandı: {e}")
+        return None
+
+
+_scrape_seo = None
+
+
+def _get_scraper():
+    """crawler modülünü (bs4 zinciriyle) ilk taramada yükler: cold start kısalır.
+
+    / ve /api/cache_stats gibi hafif istekler import maliyetini hiç ödemez.
+    """
+    global _scrape_seo
+    if _scrape_seo is None:
+        from crawler import scrape_seo
+        _scrape_seo = scrape_seo
+    return _scrape_seo
+
+
+def cached_scrape(url: str) -> dict:
+    """scrape_seo sonucunu normalize URL anahtarıyla kısa süre cache'ler.
+
+    Aynı URL için devam eden bir tarama varsa ikinci çağrı yenisini başlatmaz,
+    ilkinin Future'ını bekler (single-flight). Tarama kilit dışında çalışır;
+    kilit sadece cache ve in-flight tablosunu korur.
+    """
+    with _crawl_lock:
+        data = CRAWL_CACHE.get(url)
+        if data is not None:
+            return data
+        fut = _inflight_crawls.get(url)
+        if fut is None:
+            fut = Future()
+            _inflight_crawls[url] = fut
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return fut.result()
+    try:
+        data = _get_scraper()(url)
+    except BaseException as e:
+        with _crawl_lock:
+            _inflight_crawls.pop(url, None)
+        fut.set_exception(e)
+        raise
+    with _crawl_lock:
+        # Hatalı sonuçlar cache'lenmez: geçici bir DNS/timeout arızası 300 sn
+        # boyunca "ulaşılamadı" yanıtını sabitlemesin, site düzelince bir
+        # sonraki istek yeniden taransın
+        if not data.get("error"):
+            CRAWL_CACHE[url] = data
+        _inflight_crawls.pop(url, None)
+    fut.set_result(data)
+    return data
+
+
+def _safe_scrape(url: str) -> dict:
+    """cached_scrape'i sarmalayıp hatayı dict olarak döndürür (paralel tarama için)."""
+    try:
+        return cached_scrape(url)
+    except Exception as e:
+        return {"url": url, "error": str(e)}
 
 
 def build_analysis_prompt(crawler_data: dict) -> str:
@@ -56,7 +282,8 @@ def build_analysis_prompt(crawler_data: dict) -> str:
     if err:
         return f"Bu site için SEO analizi yap (Türkçe, kısa):\nURL: {url}\nHata: {err}"
     issues = summary.get("issues", [])
-    issues_text = " | ".join([i['text'] for i in issues]) or "Sorun yok"
+    # Sorun listesi sınırsız büyüyebilir; prompt'u token maliyetine karşı sınırla
+    issues_text = " | ".join(i['text'][:60] for i in issues[:10]) or "Sorun yok"
     title = crawler_data.get("title") or "(yok)"
     meta = crawler_data.get("meta_description") or "(yok)"
     h1 = crawler_data.get("h1_tags", [])
@@ -112,6 +339,28 @@ def build_ads_prompt(crawler_data: dict) -> str:
     )
 
 
+# Tarama başarısızsa Mistral'e gitmeye gerek yok: sabit Türkçe yanıt yeter
+CRAWL_ERROR_TEMPLATE = (
+    "{url} adresine ulaşılamadı ({err}). Site şu anda erişilebilir olmadığı için "
+    "SEO analizi yapılamadı. DNS kayıtlarını, SSL sertifikasını ve sunucunun "
+    "ayakta olduğunu kontrol edin; site erişilebilir olduğunda analizi tekrar çalıştırın."
+)
+
+EMPTY_ADS = {"keywords": [], "ad_headlines": [], "ad_descriptions": [], "negative_keywords": []}
+
+FULL_SEPARATOR = "---JSON---"
+
+
+def build_full_prompt(crawler_data: dict) -> str:
+    """Analiz + Ads önerilerini tek Mistral çağrısında isteyen birleşik prompt."""
+    return (
+        build_analysis_prompt(crawler_data)
+        + f"\n\nArdından tek başına bir satıra {FULL_SEPARATOR} yaz ve devamında "
+          "aşağıdaki görevi tamamla:\n\n"
+        + build_ads_prompt(crawler_data)
+    )
+
+
 def build_comparison_prompt(site: dict, rivals: list) -> str:
     def fmt(d):
         s = d.get("summary", {})
@@ -124,15 +373,35 @@ def build_comparison_prompt(site: dict, rivals: list) -> str:
         )
     rival_text = ""
     for i, r in enumerate(rivals, 1):
-        rival_text += f"Rakip {i} ({r.get('url','')[:40]}): {fmt(r)}\n"
+        rival_text += f"Rakip {i} ({r.get('url','')[:40]}): {fmt(r)[:200]}\n"
     return (
         f"Site karşılaştırması (Türkçe, kısa):\n"
-        f"Kendi siten ({site.get('url','')[:40]}): {fmt(site)}\n"
+        f"Kendi siten ({site.get('url','')[:40]}): {fmt(site)[:200]}\n"
         f"{rival_text}\n"
-        "1) Önde olduğun alanlar\n2) Geride olduğun alanlar\n3) En hızlı 3 kazanım"
+        "Yanıtını SADECE aşağıdaki JSON formatında ver, başka hiçbir şey yazma:\n"
+        '{\n'
+        '  "ahead": ["önde olduğun alan 1", "alan 2"],\n'
+        '  "behind": ["geride olduğun alan 1", "alan 2"],\n'
+        '  "per_rival": [\n'
+        '    {"url": "rakip url", "strengths": ["..."], "weaknesses": ["..."]}\n'
+        '  ],\n'
+        '  "quick_wins": ["en hızlı kazanım 1", "kazanım 2", "kazanım 3"]\n'
+        '}'
     )
 
 
+def _parse_comparison(raw: str):
+    """Karşılaştırma JSON'unu çözer; model formata uymazsa ham metni döndürür."""
+    clean = raw.strip()
+    if not clean.startswith("{"):
+        clean = _FENCE_RE.sub("", clean).strip()
+    try:
+        return orjson.loads(clean)
+    except Exception:
+        logger.warning("compare: JSON parse edilemedi, ham metin döndürülüyor")
+        return raw
+
+
 @app.route("/", methods=["GET"])
 def index():
     return "ASA Asistan API çalışıyor"
@@ -146,20 +415,79 @@ def analyze():
     url = (data.get("url") or "").strip()
     if not url:
         return jsonify({"error": '"url" boş olamaz'}), 400
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
+    url = _normalize_url(url)
     try:
-        crawler_data = scrape_seo(url)
+        crawler_data = cached_scrape(url)
     except Exception as e:
         return jsonify({"error": f"Crawler hatası: {str(e)}"}), 500
+    err = crawler_data.get("error")
+    if err:
+        return jsonify({"url": url, "crawler_data": crawler_data,
+                        "ai_analysis": CRAWL_ERROR_TEMPLATE.format(url=url, err=err)})
+    # ?stream=1: analizi SSE olarak akıt, ilk byte süresi tek token'a iner
+    if request.args.get("stream") == "1":
+        prompt = build_analysis_prompt(crawler_data)
+
+        def generate():
+            try:
+                for chunk in call_mistral_stream(prompt):
+                    yield f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+                yield "data: [DONE]\n\n"
+            except ValueError as e:
+                yield f"data: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+
+        return Response(stream_with_context(generate()), mimetype="text/event-stream")
     try:
         prompt = build_analysis_prompt(crawler_data)
-        ai_analysis = call_mistral(prompt)
+        domain = urlparse(url).netloc
+        ai_analysis = SEM_CACHE.get(domain, prompt) if SEM_CACHE else None
+        if ai_analysis is None:
+            ai_analysis = call_mistral(prompt)
+            if SEM_CACHE:
+                SEM_CACHE.set(domain, prompt, ai_analysis)
     except ValueError as e:
         return jsonify({"url": url, "crawler_data": crawler_data, "ai_analysis": None, "error": str(e)}), 503
     return jsonify({"url": url, "crawler_data": crawler_data, "ai_analysis": ai_analysis})
 
 
+@app.route("/api/analyze_full", methods=["POST"])
+def analyze_full():
+    """Analiz + Ads'i tek Mistral çağrısında üretir: bir LLM gidiş-dönüşü tasarruf."""
+    if not request.is_json:
+        return jsonify({"error": "Content-Type: application/json gerekli"}), 400
+    data = request.get_json()
+    url = (data.get("url") or "").strip()
+    if not url:
+        return jsonify({"error": '"url" boş olamaz'}), 400
+    url = _normalize_url(url)
+    try:
+        crawler_data = cached_scrape(url)
+    except Exception as e:
+        return jsonify({"error": f"Crawler hatası: {str(e)}"}), 500
+    err = crawler_data.get("error")
+    if err:
+        return jsonify({"url": url, "crawler_data": crawler_data,
+                        "ai_analysis": CRAWL_ERROR_TEMPLATE.format(url=url, err=err),
+                        "ads": dict(EMPTY_ADS, error_reason=err)})
+    try:
+        raw = call_mistral(build_full_prompt(crawler_data), max_tokens=1400)
+    except ValueError as e:
+        return jsonify({"url": url, "crawler_data": crawler_data,
+                        "ai_analysis": None, "ads": None, "error": str(e)}), 503
+    analysis, _, ads_raw = raw.partition(FULL_SEPARATOR)
+    ads_data = None
+    clean = ads_raw.strip()
+    if clean:
+        if not clean.startswith("{"):
+            clean = _FENCE_RE.sub("", clean).strip()
+        try:
+            ads_data = orjson.loads(clean)
+        except Exception:
+            logger.warning("analyze_full: ads JSON parse edilemedi")
+    return jsonify({"url": url, "crawler_data": crawler_data,
+                    "ai_analysis": analysis.strip(), "ads": ads_data})
+
+
 @app.route("/api/ads", methods=["POST"])
 def ads():
     if not request.is_json:
@@ -171,20 +499,24 @@ def ads():
         return jsonify({"error": '"url" boş olamaz'}), 400
     if not crawler_data:
         # Crawler'ı çalıştır
-        if not url.startswith(("http://", "https://")):
-            url = "https://" + url
+        url = _normalize_url(url)
         try:
-            crawler_data = scrape_seo(url)
+            crawler_data = cached_scrape(url)
         except Exception as e:
             return jsonify({"error": f"Crawler hatası: {str(e)}"}), 500
+    err = crawler_data.get("error")
+    if err:
+        return jsonify({"url": url, "ads": dict(EMPTY_ADS, error_reason=err)})
     try:
         prompt = build_ads_prompt(crawler_data)
         system = "Sen Google Ads uzmanısın. Yanıtını SADECE geçerli JSON formatında ver, markdown veya açıklama ekleme."
-        raw = call_mistral(prompt, system=system)
+        # temperature=0: ads çıktısı deterministik, cache'lenebilir
+        raw = call_mistral(prompt, system=system, temperature=0)
         # JSON parse
-        import json, re
-        clean = re.sub(r'```json|```', '', raw).strip()
-        ads_data = json.loads(clean)
+        clean = raw.strip()
+        if not clean.startswith("{"):
+            clean = _FENCE_RE.sub("", clean).strip()
+        ads_data = orjson.loads(clean)
     except ValueError as e:
         return jsonify({"error": str(e)}), 503
     except Exception as e:
@@ -193,7 +525,7 @@ def ads():
 
 
 @app.route("/api/compare", methods=["POST"])
-def compare():
+async def compare():
     if not request.is_json:
         return jsonify({"error": "Content-Type: application/json gerekli"}), 400
     data = request.get_json()
@@ -203,30 +535,51 @@ def compare():
         return jsonify({"error": '"url" boş olamaz'}), 400
     if not rivals:
         return jsonify({"error": 'En az 1 rakip URL gerekli'}), 400
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
-    try:
-        site_data = scrape_seo(url)
-    except Exception as e:
-        return jsonify({"error": f"Site tarama hatası: {str(e)}"}), 500
-    rival_data = []
+    url = _normalize_url(url)
+    # Normalize + tekilleştir: aynı rakip (veya sitenin kendisi) iki kez taranmaz
+    seen = {url}
+    rival_urls = []
     for r_url in rivals:
-        r_url = r_url.strip()
-        if not r_url:
+        r_url = _normalize_url(r_url)
+        if not r_url or r_url in seen:
             continue
-        if not r_url.startswith(("http://", "https://")):
-            r_url = "https://" + r_url
-        try:
-            rd = scrape_seo(r_url)
-        except Exception as e:
-            rd = {"url": r_url, "error": str(e)}
-        rival_data.append(rd)
+        seen.add(r_url)
+        rival_urls.append(r_url)
+    if not rival_urls:
+        return jsonify({"error": 'En az 1 rakip URL gerekli'}), 400
+    if len(rival_urls) > MAX_RIVALS:
+        return jsonify({"error": f"En fazla {MAX_RIVALS} rakip karşılaştırılabilir"}), 400
+    # Pipeline: önce kendi site taraması; biter bitmez site analizi Mistral'e
+    # gider, rakip taramaları bu sırada devam eder
+    site_task = asyncio.create_task(asyncio.to_thread(_safe_scrape, url))
+    rival_tasks = [asyncio.create_task(asyncio.to_thread(_safe_scrape, u)) for u in rival_urls]
+    site_data = await site_task
+    if site_data.get("error") and "summary" not in site_data:
+        for t in rival_tasks:
+            t.cancel()
+        return jsonify({"error": f"Site tarama hatası: {site_data['error']}"}), 500
+    analysis_task = asyncio.create_task(_site_analysis_async(site_data))
+    rival_data = list(await asyncio.gather(*rival_tasks))
     try:
         prompt = build_comparison_prompt(site_data, rival_data)
-        comparison = call_mistral(prompt)
+        # temperature=0: yapılandırılmış çıktı deterministik ve cache'lenebilir
+        comparison = _parse_comparison(await call_mistral_async(prompt, temperature=0))
     except ValueError as e:
+        analysis_task.cancel()
         return jsonify({"site": site_data, "rivals": rival_data, "comparison": None, "error": str(e)}), 503
-    return jsonify({"site": site_data, "rivals": rival_data, "comparison": comparison})
+    site_analysis = await analysis_task
+    return jsonify({
+        "site": site_data, "rivals": rival_data,
+        "comparison": comparison, "site_analysis": site_analysis
+    })
+
+
+@app.route("/api/cache_stats", methods=["GET"])
+def cache_stats():
+    stats = {"llm": LLM_CACHE.stats()}
+    if SEM_CACHE:
+        stats["semantic"] = SEM_CACHE.stats()
+    return jsonify(stats)
 
 
 @app.errorhandler(404)
@@ -2,115 +2,292 @@
 ASA Asistan Crawler — çok sayfalı SEO tarayıcı, encoding fix dahil.
 """
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# lxml (C parser) varsa onu kullan: html.parser'a göre 5-10x hızlı
+try:
+    BeautifulSoup(b"", "lxml")
+    PARSER = "lxml"
+except FeatureNotFound:
+    PARSER = "html.parser"
+
+# selectolax (Lexbor C parser) kuruluysa SEO çıkarımı için hızlı yol; yoksa bs4
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxHTML
+except ImportError:
+    _SelectolaxHTML = None
+
+# Sadece kurulu codec'ler ilan edilir: decode edemeyeceğimiz encoding istenmez
+_ACCEPT_ENCODING = "gzip, deflate"
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING += ", br"
+except ImportError:
+    pass
+try:
+    import zstandard  # noqa: F401
+    _ACCEPT_ENCODING += ", zstd"
+except ImportError:
+    pass
+
 HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": _ACCEPT_ENCODING,
 }
 MAX_PAGES = 5
+FETCH_WORKERS = MAX_PAGES
 REQUEST_TIMEOUT = 15
+# Sayfa başına en fazla bu kadar bayt indirilir/parse edilir
+MAX_BYTES = 2 * 1024 * 1024
+# Aynı host'a ardışık istekler arasındaki asgari süre (saniye); 0 = kapalı
+REQUEST_DELAY = float(os.environ.get("CRAWL_REQUEST_DELAY", "0"))
 
 
-def fix_encoding(text):
-    if not text:
-        return text
-    try:
-        return text.encode('latin-1').decode('utf-8')
-    except (UnicodeEncodeError, UnicodeDecodeError):
-        return text
-
-
-def get_soup(url):
-    resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-    content_type = resp.headers.get('content-type', '').lower()
-    if 'charset=' in content_type:
-        charset = content_type.split('charset=')[-1].strip().split(';')[0].strip()
-        try:
-            resp.encoding = charset
-        except Exception:
-            resp.encoding = resp.apparent_encoding or 'utf-8'
-    else:
-        resp.encoding = resp.apparent_encoding or 'utf-8'
-    return BeautifulSoup(resp.text, "html.parser"), resp.status_code
+def _make_session():
+    """Tarama başına keep-alive bağlantı havuzu: TLS el sıkışması sayfalar arası amorti edilir."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
-def get_internal_links(soup, base_url):
+# robots.txt origin başına bir kez indirilir; None = robots yok/ulaşılamadı (serbest)
+_robots_cache = {}
+_robots_lock = threading.Lock()
+
+
+def _robots_for(origin, session=None):
+    with _robots_lock:
+        if origin in _robots_cache:
+            return _robots_cache[origin]
+    rp = None
+    try:
+        if session is None:
+            r = requests.get(f"{origin}/robots.txt", headers=HEADERS, timeout=REQUEST_TIMEOUT)
+        else:
+            r = session.get(f"{origin}/robots.txt", timeout=REQUEST_TIMEOUT)
+        if r.status_code == 200:
+            rp = RobotFileParser()
+            rp.parse(r.text.splitlines())
+    except requests.RequestException:
+        pass
+    with _robots_lock:
+        if len(_robots_cache) >= 128:
+            _robots_cache.clear()
+        _robots_cache[origin] = rp
+    return rp
+
+
+def _allowed_by_robots(url, session=None):
+    parsed = urlparse(url)
+    rp = _robots_for(f"{parsed.scheme}://{parsed.netloc}", session)
+    return rp is None or rp.can_fetch(HEADERS["User-Agent"], url)
+
+
+_last_hit = {}  # host -> monotonic zaman damgası
+_last_hit_lock = threading.Lock()
+
+
+def _throttle(host):
+    """Bekleme süresini önceki aynı-host isteğinden ölçer: farklı hostlar ve
+    penceresi dolmuş istekler hiç beklemez."""
+    if REQUEST_DELAY <= 0:
+        return
+    while True:
+        now = time.monotonic()
+        with _last_hit_lock:
+            wait = REQUEST_DELAY - (now - _last_hit.get(host, 0.0))
+            if wait <= 0:
+                _last_hit[host] = now
+                return
+        time.sleep(wait)
+
+
+def fetch(url, session=None):
+    """Sayfayı indirir, (bytes, status_code, content_type) döndürür.
+
+    Gövde MAX_BYTES'ta kesilir: tek bir dev yanıt belleği ve parser'ı kilitleyemez.
+    """
+    _throttle(urlparse(url).netloc)
+    if session is None:
+        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT,
+                            allow_redirects=True, stream=True)
+    else:
+        resp = session.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True, stream=True)
+    with resp:
+        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > MAX_BYTES:
+            # Sınırı baştan aşıyorsa gövdeyi hiç indirme
+            raise ValueError(f"Yanıt çok büyük: {declared} bayt")
+        content = resp.raw.read(MAX_BYTES + 1, decode_content=True)
+        if len(content) > MAX_BYTES:
+            content = content[:MAX_BYTES]
+    return content, resp.status_code, content_type
+
+
+def get_internal_links(anchors, base_url):
     base_domain = urlparse(base_url).netloc
     links = set()
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        if href.startswith(("#", "mailto:", "tel:")):
+    for a in anchors:
+        href = a.get("href")
+        if not href:
+            continue
+        # Fragment'ı string düzeyinde at: ParseResult._replace + geturl turu gereksiz
+        href = href.split("#", 1)[0].strip()
+        if not href or href.startswith(("mailto:", "tel:", "javascript:")):
             continue
-        full_url = urljoin(base_url, href)
-        parsed = urlparse(full_url)
-        clean_url = parsed._replace(fragment="").geturl()
+        # Mutlak URL'lerde urljoin'e hiç girme
+        if not href.startswith(("http://", "https://")):
+            href = urljoin(base_url, href)
+        parsed = urlparse(href)
         if parsed.netloc == base_domain and parsed.scheme in ("http", "https"):
-            links.add(clean_url.rstrip("/"))
+            links.add(href.rstrip("/"))
     return links
 
 
 def safe_text(tag):
-    if not tag:
-        return None
-    text = tag.get_text(strip=True) if hasattr(tag, 'get_text') else str(tag)
-    try:
-        return text.encode('latin-1').decode('utf-8')
-    except (UnicodeEncodeError, UnicodeDecodeError):
-        return text
+    # Parser bytes'tan doğru charset ile decode ediyor; ekstra dönüşüm gerekmez
+    return tag.get_text(strip=True) if tag else None
+
+
+def _extract_bs4(content, url):
+    soup = BeautifulSoup(content, PARSER)
+
+    # Tek traversal: ağaç ilgili etiket başına değil, toplamda bir kez gezilir
+    buckets = {"title": None, "body": None, "meta": [], "link": [],
+               "h1": [], "h2": [], "h3": [], "img": [], "a": []}
+    for tag in soup.find_all(list(buckets)):
+        v = buckets[tag.name]
+        if isinstance(v, list):
+            v.append(tag)
+        elif v is None:
+            buckets[tag.name] = tag
+
+    title = safe_text(buckets["title"])
+
+    # Meta etiketleri tek geçişte isim -> içerik tablosuna indirgenir; ilk geçerli
+    # değer kazanır (find semantiğiyle aynı)
+    metas = {}
+    for m in buckets["meta"]:
+        key = (m.get("name") or m.get("property") or "").lower()
+        if key and key not in metas:
+            metas[key] = (m.get("content") or "").strip()
+
+    meta_description = metas.get("description") or metas.get("og:description") or None
+    og_title = metas.get("og:title") or None
+
+    canonical_tag = next((l for l in buckets["link"] if "canonical" in (l.get("rel") or [])), None)
+    canonical = canonical_tag.get("href", "").strip() if canonical_tag else None
+
+    h1_tags = [safe_text(h) for h in buckets["h1"]]
+    h2_tags = [safe_text(h) for h in buckets["h2"]]
+    h3_tags = [safe_text(h) for h in buckets["h3"]]
+    has_mobile_friendly = "width=device-width" in metas.get("viewport", "").lower()
+
+    # Akış halinde kelime sayımı: tüm gövde metnini tek string'de toplamadan,
+    # script/style içeriğini saymadan
+    body = buckets["body"]
+    word_count = 0
+    if body:
+        for el in body.descendants:
+            if isinstance(el, NavigableString):
+                if el.parent.name in ("script", "style", "noscript"):
+                    continue
+                word_count += len(el.split())
+
+    images_without_alt = sum(1 for img in buckets["img"] if not img.get("alt", "").strip())
+
+    internal_links = get_internal_links(buckets["a"], url)
+
+    return {
+        "title": title, "meta_description": meta_description,
+        "og_title": og_title, "canonical": canonical,
+        "h1_tags": h1_tags, "h2_tags": h2_tags, "h3_tags": h3_tags,
+        "word_count": word_count, "has_mobile_friendly": has_mobile_friendly,
+        "images_without_alt": images_without_alt,
+        "internal_links": list(internal_links),
+        "internal_links_count": len(internal_links),
+    }
 
 
-def scrape_page(url):
-    try:
-        soup, status = get_soup(url)
+def _extract_selectolax(content, url):
+    tree = _SelectolaxHTML(content)
 
-        title_tag = soup.find("title")
-        title = safe_text(title_tag)
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) or None if title_node else None
 
-        meta_desc = soup.find("meta", attrs={"name": "description"}) or \
-                    soup.find("meta", attrs={"property": "og:description"})
-        meta_description = meta_desc.get("content", "").strip() if meta_desc else None
-        if meta_description:
-            try:
-                meta_description = meta_description.encode('latin-1').decode('utf-8')
-            except (UnicodeEncodeError, UnicodeDecodeError):
-                pass
+    # Meta etiketleri tek css taramasıyla isim -> içerik tablosuna indirgenir
+    metas = {}
+    for m in tree.css("meta"):
+        attrs = m.attributes
+        key = (attrs.get("name") or attrs.get("property") or "").lower()
+        if key and key not in metas:
+            metas[key] = (attrs.get("content") or "").strip()
 
-        og_title_tag = soup.find("meta", attrs={"property": "og:title"})
-        og_title = og_title_tag.get("content", "").strip() if og_title_tag else None
+    meta_description = metas.get("description") or metas.get("og:description") or None
+    og_title = metas.get("og:title") or None
 
-        canonical_tag = soup.find("link", attrs={"rel": "canonical"})
-        canonical = canonical_tag.get("href", "").strip() if canonical_tag else None
+    canonical_node = tree.css_first('link[rel="canonical"]')
+    canonical = (canonical_node.attributes.get("href") or "").strip() if canonical_node else None
 
-        h1_tags = [safe_text(h) for h in soup.find_all("h1")]
-        h2_tags = [safe_text(h) for h in soup.find_all("h2")]
-        h3_tags = [safe_text(h) for h in soup.find_all("h3")]
+    h1_tags = [n.text(strip=True) for n in tree.css("h1")]
+    h2_tags = [n.text(strip=True) for n in tree.css("h2")]
+    h3_tags = [n.text(strip=True) for n in tree.css("h3")]
+    has_mobile_friendly = "width=device-width" in metas.get("viewport", "").lower()
 
-        body = soup.find("body")
-        word_count = len(body.get_text(separator=" ").split()) if body else 0
+    body = tree.body
+    word_count = 0
+    if body:
+        for node in body.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            parent = node.parent
+            if parent is not None and parent.tag in ("script", "style", "noscript"):
+                continue
+            word_count += len(node.text_content.split())
 
-        viewport = soup.find("meta", attrs={"name": "viewport"})
-        has_mobile_friendly = bool(viewport and "width=device-width" in viewport.get("content", "").lower())
+    images_without_alt = sum(
+        1 for img in tree.css("img") if not (img.attributes.get("alt") or "").strip()
+    )
 
-        images = soup.find_all("img")
-        images_without_alt = sum(1 for img in images if not img.get("alt", "").strip())
+    # attributes düz dict: get_internal_links'in beklediği .get arayüzünü sağlar
+    internal_links = get_internal_links([a.attributes for a in tree.css("a[href]")], url)
 
-        internal_links = get_internal_links(soup, url)
+    return {
+        "title": title, "meta_description": meta_description,
+        "og_title": og_title, "canonical": canonical,
+        "h1_tags": h1_tags, "h2_tags": h2_tags, "h3_tags": h3_tags,
+        "word_count": word_count, "has_mobile_friendly": has_mobile_friendly,
+        "images_without_alt": images_without_alt,
+        "internal_links": list(internal_links),
+        "internal_links_count": len(internal_links),
+    }
 
-        return {
-            "url": url, "status_code": status,
-            "title": title, "meta_description": meta_description,
-            "og_title": og_title, "canonical": canonical,
-            "h1_tags": h1_tags, "h2_tags": h2_tags, "h3_tags": h3_tags,
-            "word_count": word_count, "has_mobile_friendly": has_mobile_friendly,
-            "images_without_alt": images_without_alt,
-            "internal_links": list(internal_links),
-            "internal_links_count": len(internal_links),
-            "error": None
-        }
+
+def scrape_page(url, session=None):
+    try:
+        content, status, content_type = fetch(url, session)
+        # HTML olmayan yanıtı (PDF, görsel, JSON...) hiç parse etme
+        if content_type and "html" not in content_type and content_type != "text/plain":
+            raise ValueError(f"HTML olmayan içerik: {content_type}")
+        extract = _extract_selectolax if _SelectolaxHTML is not None else _extract_bs4
+        data = extract(content, url)
+        data.update({"url": url, "status_code": status, "error": None})
+        return data
     except Exception as e:
         return {
             "url": url, "status_code": None,
@@ -125,17 +302,32 @@ def scrape_page(url):
 
 def build_summary(pages):
     successful = [p for p in pages if not p.get("error")]
-    error_pages_list = [p for p in pages if p.get("error")]
+    error_count = len(pages) - len(successful)
+
+    # Tek geçiş: sayfa listesi metrik başına değil, toplamda bir kez gezilir
+    total_words = total_images_without_alt = 0
+    pages_missing_title = []
+    pages_missing_meta = []
+    pages_missing_h1 = []
+    pages_with_multiple_h1 = []
+    pages_not_mobile_friendly = []
+    for p in successful:
+        u = p["url"]
+        h1 = p.get("h1_tags") or []
+        total_words += p.get("word_count", 0)
+        total_images_without_alt += p.get("images_without_alt", 0)
+        if not p.get("title"):
+            pages_missing_title.append(u)
+        if not p.get("meta_description"):
+            pages_missing_meta.append(u)
+        if not h1:
+            pages_missing_h1.append(u)
+        elif len(h1) > 1:
+            pages_with_multiple_h1.append(u)
+        if not p.get("has_mobile_friendly"):
+            pages_not_mobile_friendly.append(u)
 
-    total_words = sum(p.get("word_count", 0) for p in successful)
     avg_word_count = round(total_words / len(successful)) if successful else 0
-    total_images_without_alt = sum(p.get("images_without_alt", 0) for p in successful)
-
-    pages_missing_title = [p["url"] for p in successful if not p.get("title")]
-    pages_missing_meta = [p["url"] for p in successful if not p.get("meta_description")]
-    pages_missing_h1 = [p["url"] for p in successful if not p.get("h1_tags")]
-    pages_with_multiple_h1 = [p["url"] for p in successful if len(p.get("h1_tags", [])) > 1]
-    pages_not_mobile_friendly = [p["url"] for p in successful if not p.get("has_mobile_friendly")]
 
     issues = []
     if pages_with_multiple_h1:
@@ -156,7 +348,7 @@ def build_summary(pages):
     return {
         "total_pages_crawled": len(pages),
         "successful_pages": len(successful),
-        "error_pages": len(error_pages_list),
+        "error_pages": error_count,
         "avg_word_count": avg_word_count,
         "total_images_without_alt": total_images_without_alt,
         "pages_missing_title": pages_missing_title,
@@ -170,23 +362,47 @@ def build_summary(pages):
 
 def scrape_seo(start_url):
     visited = set()
-    to_visit = [start_url]
+    frontier = [start_url]
     pages = []
-
-    while to_visit and len(pages) < MAX_PAGES:
-        url = to_visit.pop(0)
-        parsed = urlparse(url)
-        clean_url = parsed._replace(fragment="").geturl().rstrip("/") or url
-        if clean_url in visited:
-            continue
-        visited.add(clean_url)
-        logger.info(f"Taranıyor: {clean_url}")
-        page_data = scrape_page(clean_url)
-        pages.append(page_data)
-        if not page_data.get("error"):
-            for link in page_data.get("internal_links", []):
-                if link not in visited and link not in to_visit:
-                    to_visit.append(link)
+    session = _make_session()
+
+    # BFS seviyesindeki sayfalar paralel çekilir: süre toplam yerine en yavaş sayfaya iner
+    while frontier and len(pages) < MAX_PAGES:
+        batch = []
+        for url in frontier:
+            parsed = urlparse(url)
+            clean_url = parsed._replace(fragment="").geturl().rstrip("/") or url
+            if clean_url in visited:
+                continue
+            visited.add(clean_url)
+            # Başlangıç URL'i (kullanıcının kendi isteği) her zaman taranır;
+            # keşfedilen alt sayfalar robots.txt'e uyar
+            if pages and not _allowed_by_robots(clean_url, session):
+                continue
+            batch.append(clean_url)
+            if len(pages) + len(batch) >= MAX_PAGES:
+                break
+        if not batch:
+            break
+        logger.info(f"Taranıyor ({len(batch)} sayfa): {', '.join(batch)}")
+        # scrape_page hem indirir hem ayrıştırır: selectolax/lxml C parser'ları
+        # GIL'i bıraktığı için parse işi de worker thread'lerde çakışık yürür,
+        # ayrı bir ProcessPool + pickle turuna gerek kalmaz
+        if len(batch) == 1:
+            results = [scrape_page(batch[0], session)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(batch), FETCH_WORKERS)) as ex:
+                results = list(ex.map(lambda u: scrape_page(u, session), batch))
+        frontier = []
+        queued = set()
+        for page_data in results:
+            pages.append(page_data)
+            if not page_data.get("error"):
+                for link in page_data.get("internal_links", []):
+                    # Set üyeliği: liste taraması O(N²)'ye dönmeden tekilleştir
+                    if link not in visited and link not in queued:
+                        queued.add(link)
+                        frontier.append(link)
 
     summary = build_summary(pages)
     homepage = pages[0] if pages else {}
@@ -0,0 +1,86 @@
+"""
+ASA Asistan LLM önbelleği — (model, system, prompt, max_tokens) anahtarlı deterministik yanıt cache'i.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class LLMCache:
+    """Bellek içi LRU + TTL cache; REDIS_URL verilirse Redis'i ikinci katman olarak kullanır."""
+
+    def __init__(self, maxsize=512, ttl=3600, redis_url=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._mem = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(redis_url)
+            except Exception:
+                self._redis = None
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item:
+                expires_at, value = item
+                if expires_at > now:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._mem[key]
+        if self._redis is not None:
+            try:
+                value = self._redis.get(f"llm:{key}")
+            except Exception:
+                value = None
+            if value is not None:
+                value = value.decode("utf-8")
+                with self._lock:
+                    self.hits += 1
+                    self._mem[key] = (now + self.ttl, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        with self._lock:
+            self._mem[key] = (time.time() + ttl, value)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+        if self._redis is not None:
+            try:
+                self._redis.setex(f"llm:{key}", ttl, value)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._mem),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "redis": self._redis is not None,
+            }
@@ -0,0 +1,91 @@
+"""
+ASA Asistan semantik önbellek — prompt embedding benzerliğiyle önceki Mistral yanıtını eşleştirir.
+sentence-transformers + faiss kuruluysa çalışır; yoksa sessizce devre dışı kalır.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    _AVAILABLE = True
+except ImportError:
+    _AVAILABLE = False
+
+# Türkçe içerik için çok dilli model
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+SIMILARITY_THRESHOLD = 0.92
+
+
+class SemanticCache:
+    """Cosine benzerliği eşiği aşan promptlar için cache'lenmiş yanıtı döndürür.
+
+    Girdiler domain'e göre kilitlenir: farklı sitelerin benzer promptları
+    birbirine karışmaz.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, maxsize=256):
+        self.enabled = _AVAILABLE
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._model = None
+        self._index = None
+        self._entries = []  # index sırasıyla (domain, response)
+        if not self.enabled:
+            logger.info("Semantik cache devre dışı (sentence-transformers/faiss kurulu değil)")
+
+    def _embed(self, text):
+        if self._model is None:
+            self._model = SentenceTransformer(MODEL_NAME)
+        emb = self._model.encode([text], normalize_embeddings=True)
+        return np.asarray(emb, dtype="float32")
+
+    def get(self, domain: str, prompt: str):
+        if not self.enabled:
+            return None
+        emb = self._embed(prompt)
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+            k = min(4, self._index.ntotal)
+            scores, ids = self._index.search(emb, k)
+            for score, idx in zip(scores[0], ids[0]):
+                if idx < 0 or score < self.threshold:
+                    continue
+                entry_domain, response = self._entries[idx]
+                if entry_domain == domain:
+                    self.hits += 1
+                    return response
+            self.misses += 1
+            return None
+
+    def set(self, domain: str, prompt: str, response: str):
+        if not self.enabled:
+            return
+        emb = self._embed(prompt)
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(emb.shape[1])
+            elif len(self._entries) >= self.maxsize:
+                # Sınırı aşınca sıfırla: basit ve bellek kullanımı sınırlı kalır
+                self._index.reset()
+                self._entries.clear()
+            self._index.add(emb)
+            self._entries.append((domain, response))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "threshold": self.threshold,
+            }
@@ -0,0 +1,4 @@
+"""
+Gunicorn giriş noktası — bkz. Procfile.
+"""
+from app import app  # noqa: F401